@@ -1,22 +1,42 @@
 # Interactive Feedback MCP UI
 # Developed by Fábio Ferreira (https://x.com/fabiomlferreira)
 # Inspired by/related to dotcursorrules.com (https://dotcursorrules.com/)
+import io
 import os
+import atexit
+import codecs
 import sys
 import json
+import shlex
+import errno
+import signal
+import select
 import psutil
 import argparse
-import subprocess
-import threading
+import queue
+import string
 import hashlib
+import functools
+from dataclasses import dataclass, asdict
 from typing import Optional, TypedDict
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QCheckBox, QTextEdit, QGroupBox
 )
-from PySide6.QtCore import Qt, Signal, QObject, QTimer, QSettings
-from PySide6.QtGui import QTextCursor, QIcon, QKeyEvent, QFont, QFontDatabase, QPalette, QColor
+from PySide6.QtCore import (
+    Qt, Slot, QTimer, QSettings, QPointF, QProcess, QProcessEnvironment, QThread,
+    QEventLoop
+)
+from PySide6.QtGui import (
+    QTextCursor, QIcon, QKeyEvent, QFont, QFontDatabase,
+    QPainter, QStaticText, QPixmap, QPixmapCache
+)
 
 class FeedbackResult(TypedDict):
     command_logs: str
@@ -53,59 +73,31 @@ def set_dark_title_bar(widget: QWidget, dark_title_bar: bool) -> None:
     c_dark_title_bar = c_uint32(dark_title_bar)  # Convert to C-compatible uint32
     dwmapi.DwmSetWindowAttribute(hwnd, attribute, byref(c_dark_title_bar), 4)
 
-    # HACK: Create a 1x1 pixel frameless window to force redraw
-    temp_widget = QWidget(None, Qt.FramelessWindowHint)
-    temp_widget.resize(1, 1)
-    temp_widget.move(widget.pos())
-    temp_widget.show()
-    temp_widget.deleteLater()  # Safe deletion in Qt event loop
-
-def get_apple_design_palette(app: QApplication):
-    """Create Apple-inspired design palette with enhanced color system"""
-    palette = app.palette()
-    
-    # Apple-inspired colors
-    # Background colors
-    palette.setColor(QPalette.Window, QColor(28, 28, 30))  # Apple dark background
-    palette.setColor(QPalette.Base, QColor(44, 44, 46))    # Card background
-    palette.setColor(QPalette.AlternateBase, QColor(58, 58, 60))  # Alternate background
-    
-    # Text colors
-    palette.setColor(QPalette.WindowText, QColor(255, 255, 255))  # Primary text
-    palette.setColor(QPalette.Text, QColor(255, 255, 255))        # Primary text
-    palette.setColor(QPalette.PlaceholderText, QColor(142, 142, 147))  # Secondary text
-    palette.setColor(QPalette.Disabled, QPalette.Text, QColor(142, 142, 147))
-    palette.setColor(QPalette.Disabled, QPalette.WindowText, QColor(142, 142, 147))
-    
-    # Button colors
-    palette.setColor(QPalette.Button, QColor(44, 44, 46))
-    palette.setColor(QPalette.ButtonText, QColor(255, 255, 255))
-    palette.setColor(QPalette.Disabled, QPalette.ButtonText, QColor(142, 142, 147))
-    
-    # Highlight colors (Apple Blue)
-    palette.setColor(QPalette.Highlight, QColor(0, 122, 255))     # Apple Blue
-    palette.setColor(QPalette.HighlightedText, QColor(255, 255, 255))
-    
-    # Other colors
-    palette.setColor(QPalette.Link, QColor(0, 122, 255))          # Apple Blue
-    palette.setColor(QPalette.BrightText, QColor(255, 55, 48))    # Apple Red
-    palette.setColor(QPalette.ToolTipBase, QColor(44, 44, 46))
-    palette.setColor(QPalette.ToolTipText, QColor(255, 255, 255))
-    
-    # Border and shadow colors
-    palette.setColor(QPalette.Dark, QColor(84, 84, 88))
-    palette.setColor(QPalette.Shadow, QColor(0, 0, 0))
-    
-    return palette
-
-def get_apple_styles():
-    """Return comprehensive Apple-inspired stylesheet"""
-    return """
+    # Ask DWM to re-render the non-client area so the new title bar color
+    # shows immediately. SWP_FRAMECHANGED | SWP_NOSIZE | SWP_NOMOVE | SWP_NOZORDER
+    SWP_FLAGS = 0x0020 | 0x0001 | 0x0002 | 0x0004
+    windll.user32.SetWindowPos(hwnd, 0, 0, 0, 0, 0, SWP_FLAGS)
+
+@dataclass(frozen=True)
+class Theme:
+    """The distinct colors the Apple stylesheet is rendered from."""
+    accent: str = "#007AFF"
+    accent_hover: str = "#0084FF"
+    success: str = "#34C759"
+    success_hover: str = "#3BCC5F"
+    text: str = "#FFFFFF"
+    text_secondary: str = "#8E8E93"
+    console_fg: str = "#00FF00"
+
+# Comprehensive Apple-inspired stylesheet template. string.Template is used
+# rather than str.format because Qt CSS is full of literal braces. Kept at
+# module scope so the ~5 KB literal is materialized once per process.
+_STYLE_TMPL = string.Template("""
     /* Main Window Styling */
     QMainWindow {
         background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
                                    stop:0 #1C1C1E, stop:1 #2C2C2E);
-        color: #FFFFFF;
+        color: $text;
     }
     
     /* Group Box Styling - Card Style */
@@ -117,7 +109,7 @@ def get_apple_styles():
         padding: 20px 16px 16px 16px;
         font-weight: 600;
         font-size: 15px;
-        color: #FFFFFF;
+        color: $text;
     }
     
     QGroupBox::title {
@@ -127,16 +119,16 @@ def get_apple_styles():
         background: rgba(44, 44, 46, 0.95);
         padding: 4px 12px;
         border-radius: 8px;
-        color: #FFFFFF;
+        color: $text;
     }
     
     /* Button Styling */
     QPushButton {
         background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                   stop:0 #007AFF, stop:1 #0051D5);
+                                   stop:0 $accent, stop:1 #0051D5);
         border: none;
         border-radius: 12px;
-        color: #FFFFFF;
+        color: $text;
         font-weight: 600;
         font-size: 14px;
         padding: 12px 24px;
@@ -145,7 +137,7 @@ def get_apple_styles():
     
     QPushButton:hover {
         background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                   stop:0 #0084FF, stop:1 #0056E0);
+                                   stop:0 $accent_hover, stop:1 #0056E0);
         transform: translateY(-1px);
     }
     
@@ -164,7 +156,7 @@ def get_apple_styles():
     QPushButton#secondaryButton {
         background: rgba(142, 142, 147, 0.2);
         border: 1px solid rgba(84, 84, 88, 0.6);
-        color: #FFFFFF;
+        color: $text;
     }
     
     QPushButton#secondaryButton:hover {
@@ -175,12 +167,12 @@ def get_apple_styles():
     /* Success Button Style */
     QPushButton#successButton {
         background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                   stop:0 #34C759, stop:1 #2DB346);
+                                   stop:0 $success, stop:1 #2DB346);
     }
     
     QPushButton#successButton:hover {
         background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                   stop:0 #3BCC5F, stop:1 #32BA4C);
+                                   stop:0 $success_hover, stop:1 #32BA4C);
     }
     
     /* Toggle Button Style */
@@ -188,7 +180,7 @@ def get_apple_styles():
         background: rgba(58, 58, 60, 0.8);
         border: 1px solid rgba(84, 84, 88, 0.6);
         border-radius: 10px;
-        color: #FFFFFF;
+        color: $text;
         font-weight: 500;
         font-size: 14px;
         padding: 10px 20px;
@@ -199,7 +191,7 @@ def get_apple_styles():
     QPushButton#toggleButton:hover {
         background: rgba(68, 68, 70, 0.9);
         border-color: rgba(84, 84, 88, 0.8);
-        color: #FFFFFF;
+        color: $text;
     }
     
     QPushButton#toggleButton:pressed {
@@ -214,12 +206,12 @@ def get_apple_styles():
         border-radius: 10px;
         padding: 12px 16px;
         font-size: 14px;
-        color: #FFFFFF;
-        selection-background-color: #007AFF;
+        color: $text;
+        selection-background-color: $accent;
     }
     
     QLineEdit:focus {
-        border-color: #007AFF;
+        border-color: $accent;
         background: rgba(58, 58, 60, 0.9);
     }
     
@@ -235,13 +227,13 @@ def get_apple_styles():
         border-radius: 12px;
         padding: 16px;
         font-size: 14px;
-        color: #FFFFFF;
-        selection-background-color: #007AFF;
+        color: $text;
+        selection-background-color: $accent;
         line-height: 1.4;
     }
     
     QTextEdit:focus {
-        border-color: #007AFF;
+        border-color: $accent;
         background: rgba(58, 58, 60, 0.9);
     }
     
@@ -253,13 +245,13 @@ def get_apple_styles():
         padding: 12px;
         font-family: 'SF Mono', 'Monaco', 'Consolas', 'Courier New', monospace;
         font-size: 12px;
-        color: #00FF00;
+        color: $console_fg;
         selection-background-color: rgba(0, 122, 255, 0.3);
     }
     
     /* Checkbox Styling */
     QCheckBox {
-        color: #FFFFFF;
+        color: $text;
         font-size: 14px;
         spacing: 8px;
     }
@@ -273,19 +265,19 @@ def get_apple_styles():
     }
     
     QCheckBox::indicator:hover {
-        border-color: #007AFF;
+        border-color: $accent;
         background: rgba(58, 58, 60, 0.9);
     }
     
     QCheckBox::indicator:checked {
-        background: #007AFF;
-        border-color: #007AFF;
-        image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTIiIGhlaWdodD0iOSIgdmlld0JveD0iMCAwIDEyIDkiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+CjxwYXRoIGQ9Ik0xMC42IDEuNEw0LjI1IDcuNzVMMSA0LjUiIHN0cm9rZT0id2hpdGUiIHN0cm9rZS13aWR0aD0iMS41IiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiLz4KPC9zdmc+);
+        background: $accent;
+        border-color: $accent;
+        image: url("$check_icon");
     }
     
     /* Label Styling */
     QLabel {
-        color: #FFFFFF;
+        color: $text;
         font-size: 14px;
         line-height: 1.4;
     }
@@ -293,28 +285,28 @@ def get_apple_styles():
     QLabel#sectionTitle {
         font-size: 17px;
         font-weight: 600;
-        color: #FFFFFF;
+        color: $text;
         margin-bottom: 8px;
     }
     
     QLabel#secondaryLabel {
-        color: #8E8E93;
+        color: $text_secondary;
         font-size: 13px;
     }
     
     QLabel#contactLabel {
-        color: #8E8E93;
+        color: $text_secondary;
         font-size: 11px;
         padding: 16px;
     }
     
     QLabel#contactLabel a {
-        color: #007AFF;
+        color: $accent;
         text-decoration: none;
     }
     
     QLabel#contactLabel a:hover {
-        color: #0084FF;
+        color: $accent_hover;
         text-decoration: underline;
     }
     
@@ -372,22 +364,131 @@ def get_apple_styles():
     }
     
     /* Animation-like transitions would be handled in code with QPropertyAnimation */
+    """)
+
+# File-backed icon for checked checkboxes: Qt caches pixmaps loaded from
+# url() file paths, whereas a base64 data URI is re-decoded per style
+# resolution. Forward slashes keep the url() valid on Windows.
+_CHECK_ICON_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "images", "check.svg"
+).replace("\\", "/")
+
+@functools.lru_cache(maxsize=4)
+def styles_for(theme: Theme) -> str:
+    """Render the stylesheet for a theme, caching the result per theme."""
+    return _STYLE_TMPL.substitute(asdict(theme), check_icon=_CHECK_ICON_PATH)
+
+def get_apple_styles():
+    """Return comprehensive Apple-inspired stylesheet"""
+    return styles_for(Theme())
+
+# Warning style for the Run button while a command is running. Built once at
+# import so each click reuses the already-materialized sheet.
+_STOP_BUTTON_QSS = """
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                   stop:0 #FF3B30, stop:1 #D70015);
+        border: none;
+        border-radius: 12px;
+        color: #FFFFFF;
+        font-weight: 600;
+        font-size: 14px;
+        padding: 12px 24px;
+        min-height: 20px;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                   stop:0 #FF453A, stop:1 #DC1E1E);
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                   stop:0 #D70015, stop:1 #B20000);
+    }
+"""
+
+def _kill_tree_pidfd(procs: list[psutil.Process], timeout_ms: int = 2000) -> bool:
+    """Kill processes and reap them event-driven via pidfd_open + poll.
+
+    One poll() call covers the whole tree instead of stat()-ing /proc per
+    process. Returns False when pidfds are unavailable (old kernel/Python) so
+    the caller can fall back to the portable psutil path.
     """
+    if not (hasattr(os, "pidfd_open") and hasattr(signal, "pidfd_send_signal")):
+        return False
+
+    poller = select.poll()
+    pidfds = []
+    try:
+        for proc in procs:
+            try:
+                fd = os.pidfd_open(proc.pid)
+            except OSError as e:
+                if e.errno == errno.ENOSYS:
+                    return False  # kernel < 5.3
+                continue  # process already exited
+            pidfds.append(fd)
+            poller.register(fd, select.POLLIN)
+            try:
+                signal.pidfd_send_signal(fd, signal.SIGKILL)
+            except OSError:
+                pass
+
+        # A pidfd becomes readable once its process exits
+        remaining = len(pidfds)
+        while remaining:
+            events = poller.poll(timeout_ms)
+            if not events:
+                break  # timed out; SIGKILL was already delivered
+            for fd, _ in events:
+                poller.unregister(fd)
+                remaining -= 1
+    finally:
+        for fd in pidfds:
+            os.close(fd)
+    return True
+
+def _split_direct_command(command: str) -> Optional[list]:
+    """Split a command into argv when it needs no shell features.
+
+    Returns None when the command uses shell metacharacters (pipes,
+    redirection, globbing, expansion, ...) and has to go through a shell,
+    and on Windows, where cmd.exe quoting rules differ from shlex.
+    """
+    if sys.platform == "win32":
+        return None
+    if any(ch in command for ch in "|&;<>()$`*?[]{}~#\n"):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv:
+        return None
+    if "=" in argv[0]:
+        # "FOO=1 make" is a shell env assignment, not a program named FOO=1
+        return None
+    return argv
+
+def kill_tree(pid: int):
+    if pid <= 0:
+        return
+    try:
+        parent = psutil.Process(pid)
+    except psutil.Error:
+        return
+    procs = parent.children(recursive=True)
+    procs.append(parent)
+
+    if sys.platform == "linux" and _kill_tree_pidfd(procs):
+        return
 
-def kill_tree(process: subprocess.Popen):
     killed: list[psutil.Process] = []
-    parent = psutil.Process(process.pid)
-    for proc in parent.children(recursive=True):
+    for proc in procs:
         try:
             proc.kill()
             killed.append(proc)
         except psutil.Error:
             pass
-    try:
-        parent.kill()
-    except psutil.Error:
-        pass
-    killed.append(parent)
 
     # Terminate any remaining processes
     for proc in killed:
@@ -445,32 +546,23 @@ def get_user_environment() -> dict[str, str]:
             raise RuntimeError("Failed to create environment block")
 
         try:
-            # Convert environment block to list of strings
+            # The block is a sequence of NUL-terminated "KEY=value" strings
+            # ending with an empty string. wstring_at copies each entry in one
+            # go instead of accumulating it character by character.
             result = {}
-            env_ptr = ctypes.cast(environment, ctypes.POINTER(ctypes.c_wchar))
-            offset = 0
+            address = environment.value
+            wchar_size = ctypes.sizeof(ctypes.c_wchar)
 
             while True:
-                # Get string at current offset
-                current_string = ""
-                while env_ptr[offset] != "\0":
-                    current_string += env_ptr[offset]
-                    offset += 1
-
-                # Skip null terminator
-                offset += 1
-
-                # Break if we hit double null terminator
-                if not current_string:
+                entry = ctypes.wstring_at(address)
+                if not entry:
+                    # Empty string means we hit the double null terminator
                     break
+                address += (len(entry) + 1) * wchar_size
 
-                equal_index = current_string.index("=")
-                if equal_index == -1:
-                    continue
-
-                key = current_string[:equal_index]
-                value = current_string[equal_index + 1:]
-                result[key] = value
+                key, sep, value = entry.partition("=")
+                if sep:
+                    result[key] = value
 
             return result
 
@@ -480,50 +572,176 @@ def get_user_environment() -> dict[str, str]:
     finally:
         CloseHandle(token)
 
-class FeedbackTextEdit(QTextEdit):
+# Cap on the in-memory session log (characters). A long build or verbose test
+# run shouldn't be able to grow RSS without bound just to be submitted later.
+_LOG_BUFFER_LIMIT = 4 * 1024 * 1024
+# Most chunks a single flush will render; anything older is summarized
+_LOG_FLUSH_MAX_CHUNKS = 5000
+
+def _settings_bool(value) -> bool:
+    # QSettings backends may hand booleans back as the strings "true"/"false"
+    if isinstance(value, str):
+        return value.lower() == "true"
+    return bool(value)
+
+_WINDOW_ICON: Optional[QIcon] = None
+
+def _get_window_icon() -> QIcon:
+    """Decode the window icon PNG once per process and share the pixmap."""
+    global _WINDOW_ICON
+    if _WINDOW_ICON is None:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        pixmap = QPixmap(os.path.join(script_dir, "images", "feedback.png"))
+        QPixmapCache.insert("feedback_icon", pixmap)
+        _WINDOW_ICON = QIcon(pixmap)
+    return _WINDOW_ICON
+
+class SettingsWriter(QThread):
+    """Persists QSettings writes off the UI thread.
+
+    The UI enqueues (group, key, value) tuples; the worker owns its own
+    QSettings instance and drains the queue in batches with one
+    beginGroup/endGroup per group, so window close never blocks on the
+    settings backend's disk I/O.
+    """
+    _STOP = object()
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._queue: queue.Queue = queue.Queue()
+
+    def enqueue(self, group: str, key: str, value) -> None:
+        self._queue.put((group, key, value))
+
+    def stop(self) -> None:
+        # Sentinel: run() flushes whatever is still queued and exits
+        self._queue.put(self._STOP)
+
+    def run(self) -> None:
+        settings = QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            # Drain everything currently queued into one batch
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if self._STOP in batch:
+                batch = [item for item in batch if item is not self._STOP]
+                running = False
+            self._write_batch(settings, batch)
+        settings.sync()
+
+    @staticmethod
+    def _write_batch(settings: QSettings, batch: list) -> None:
+        by_group: dict = {}
+        for group, key, value in batch:
+            by_group.setdefault(group, []).append((key, value))
+        for group, values in by_group.items():
+            settings.beginGroup(group)
+            for key, value in values:
+                settings.setValue(key, value)
+            settings.endGroup()
+
+_SETTINGS_WRITER: Optional[SettingsWriter] = None
+
+def _get_settings_writer() -> SettingsWriter:
+    global _SETTINGS_WRITER
+    if _SETTINGS_WRITER is None or not _SETTINGS_WRITER.isRunning():
+        _SETTINGS_WRITER = SettingsWriter()
+        _SETTINGS_WRITER.start()
+    return _SETTINGS_WRITER
+
+def _stop_settings_writer() -> None:
+    # The writer is shared by every window in the process, so it outlives
+    # any single closeEvent and is drained once at interpreter exit
+    writer = _SETTINGS_WRITER
+    if writer is not None and writer.isRunning():
+        writer.stop()
+        writer.wait(2000)
+
+atexit.register(_stop_settings_writer)
+
+class StaticLabel(QLabel):
+    """QLabel for plain, non-interactive text that caches its text layout.
+
+    QStaticText keeps the shaped glyph runs between paints, so the repeated
+    redraws from resizes and command-section toggles skip re-shaping. Only
+    suitable for plain text without links or word wrap.
+    """
+    def __init__(self, text: str = "", parent=None):
+        super().__init__(text, parent)
+        self._static_text = QStaticText(text)
+        self._static_text.setPerformanceHint(QStaticText.AggressiveCaching)
+
+    def setText(self, text: str) -> None:
+        if text != self.text():
+            self._static_text.setText(text)
+        super().setText(text)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.setFont(self.font())
+        painter.setPen(self.palette().color(self.foregroundRole()))
+        rect = self.contentsRect()
+        y = rect.y() + (rect.height() - self._static_text.size().height()) / 2
+        painter.drawStaticText(QPointF(rect.x(), y), self._static_text)
+
+class FeedbackTextEdit(QTextEdit):
+    def __init__(self, parent=None, submit_callback=None):
+        super().__init__(parent)
+        # Injected at construction so Ctrl+Enter doesn't have to walk the
+        # parent chain looking for the FeedbackUI instance on every keypress
+        self._submit_callback = submit_callback
 
     def keyPressEvent(self, event: QKeyEvent):
         if event.key() == Qt.Key_Return and event.modifiers() == Qt.ControlModifier:
-            # Find the parent FeedbackUI instance and call submit
-            parent = self.parent()
-            while parent and not isinstance(parent, FeedbackUI):
-                parent = parent.parent()
-            if parent:
-                parent._submit_feedback()
+            if self._submit_callback:
+                self._submit_callback()
         else:
             super().keyPressEvent(event)
 
-class LogSignals(QObject):
-    append_log = Signal(str)
-
 class FeedbackUI(QMainWindow):
     def __init__(self, project_directory: str, prompt: str):
         super().__init__()
         self.project_directory = project_directory
         self.prompt = prompt
 
-        self.process: Optional[subprocess.Popen] = None
-        self.log_buffer = []
+        self.process: Optional[QProcess] = None
+        self._user_env: Optional[QProcessEnvironment] = None
+        self._event_loop: Optional[QEventLoop] = None
+        # Incremental decoders carry UTF-8 sequences that arrive split across
+        # chunk boundaries instead of silently dropping the partial bytes
+        self._stdout_decoder = codecs.getincrementaldecoder("utf-8")("ignore")
+        self._stderr_decoder = codecs.getincrementaldecoder("utf-8")("ignore")
+        # StringIO keeps one resizable buffer instead of thousands of small
+        # Python strings that would be re-joined at submit time
+        self.log_buffer = io.StringIO()
         self.feedback_result = None
-        self.log_signals = LogSignals()
-        self.log_signals.append_log.connect(self._append_log)
+
+        # Coalesce console appends: bursts of subprocess output get flushed to
+        # the QTextEdit once per ~frame instead of one relayout per chunk
+        self._pending_log: list[str] = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(16)
+        self._log_flush_timer.timeout.connect(self._flush_pending_log)
 
         self.setWindowTitle("Interactive Feedback • MCP")
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        icon_path = os.path.join(script_dir, "images", "feedback.png")
-        self.setWindowIcon(QIcon(icon_path))
+        self.setWindowIcon(_get_window_icon())
         
         # Configure window properties for better Apple-like appearance
-        self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground, False)  # Ensure solid background
         
         self.settings = QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
+        self._settings_writer = _get_settings_writer()
         
-        # Load general UI settings for the main window (geometry, state)
-        self.settings.beginGroup("MainWindow_General")
-        geometry = self.settings.value("geometry")
+        # Load general UI settings for the main window (geometry, state).
+        # Full-path keys avoid the beginGroup/endGroup stack churn — each group
+        # push/pop takes the settings mutex and re-resolves the prefix.
+        geometry = self.settings.value("MainWindow_General/geometry")
         if geometry:
             self.restoreGeometry(geometry)
         else:
@@ -532,32 +750,59 @@ class FeedbackUI(QMainWindow):
             x = (screen.width() - 800) // 2
             y = (screen.height() - 600) // 2
             self.move(x, y)
-        state = self.settings.value("windowState")
+        state = self.settings.value("MainWindow_General/windowState")
         if state:
             self.restoreState(state)
-        self.settings.endGroup() # End "MainWindow_General" group
-        
+        # Geometry/state are only re-serialized at close if the window was
+        # actually moved or resized, and only written if the bytes differ
+        self._loaded_geometry = geometry
+        self._loaded_window_state = state
+        self._geometry_dirty = False
+
         # Load project-specific settings (command, auto-execute, command section visibility)
+        # in a single pass: every stored key goes into a plain dict, so the rest
+        # of startup does cheap dict lookups instead of per-key QSettings.value
+        # calls (each one a mutex acquire plus QVariant conversion).
         self.project_group_name = get_project_settings_group(self.project_directory)
         self.settings.beginGroup(self.project_group_name)
-        loaded_run_command = self.settings.value("run_command", "", type=str)
-        loaded_execute_auto = self.settings.value("execute_automatically", False, type=bool)
-        command_section_visible = self.settings.value("commandSectionVisible", False, type=bool)
+        self._project_settings = {key: self.settings.value(key) for key in self.settings.allKeys()}
         self.settings.endGroup() # End project-specific group
+
+        loaded_run_command = str(self._project_settings.get("run_command") or "")
+        loaded_execute_auto = _settings_bool(self._project_settings.get("execute_automatically"))
+        command_section_visible = _settings_bool(self._project_settings.get("commandSectionVisible"))
+        stay_on_top = _settings_bool(self._project_settings.get("stayOnTop"))
+
+        # Always-on-top is opt-in per project: it forces the compositor to
+        # re-evaluate stacking on every focus change and defeats occlusion
+        # culling, so don't pay for it unless the user asked.
+        if stay_on_top:
+            self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
         
         self.config: FeedbackConfig = {
             "run_command": loaded_run_command,
             "execute_automatically": loaded_execute_auto
         }
 
+        # Debounce QSettings writes: textChanged fires per keystroke and every
+        # write can hit the registry/plist (or fdatasync on Linux), so changes
+        # only mark keys dirty against the in-memory snapshot and a single
+        # flush writes them out.
+        self._settings_dirty: set = set()
+        self._settings_flush_timer = QTimer(self)
+        self._settings_flush_timer.setSingleShot(True)
+        self._settings_flush_timer.setInterval(2000)
+        self._settings_flush_timer.timeout.connect(self._flush_settings)
+
         self._create_ui() # self.config is used here to set initial values
 
-        # Set command section visibility AFTER _create_ui has created relevant widgets
-        self.command_group.setVisible(command_section_visible)
+        # The command section is built lazily; only materialize it now when
+        # this project wants it visible or needs it for auto-execution.
+        if command_section_visible or self.config.get("execute_automatically", False):
+            self._ensure_command_section()
+            self.command_group.setVisible(command_section_visible)
         if command_section_visible:
             self.toggle_command_button.setText("Hide Command & Console")
-        else:
-            self.toggle_command_button.setText("Show Command & Console")
 
         set_dark_title_bar(self, True)
 
@@ -576,10 +821,11 @@ class FeedbackUI(QMainWindow):
     def _create_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
-        
-        # Apply Apple styles to the application
-        self.setStyleSheet(get_apple_styles())
-        
+
+        # The Apple stylesheet is applied once at the QApplication level (see
+        # feedback_ui()); re-applying it per window would force Qt to re-polish
+        # the whole widget subtree for no visual difference.
+
         # Improved layout with proper spacing
         layout = QVBoxLayout(central_widget)
         layout.setContentsMargins(24, 24, 24, 24)
@@ -600,15 +846,86 @@ class FeedbackUI(QMainWindow):
         self.toggle_command_button.clicked.connect(self._toggle_command_section)
         layout.addWidget(self.toggle_command_button)
 
+        # Command section is expensive (line edit, buttons, console text edit,
+        # font database query) and hidden by default, so it is built on demand
+        # by _ensure_command_section.
+        self.command_group = None
+
+        # Feedback section with enhanced Apple card design
+        self.feedback_group = QGroupBox("Interactive Feedback")
+        feedback_layout = QVBoxLayout(self.feedback_group)
+        feedback_layout.setSpacing(16)
+        feedback_layout.setContentsMargins(20, 24, 20, 20)
+
+        # Description label with better typography
+        self.description_label = QLabel(self.prompt)
+        self.description_label.setWordWrap(True)
+        self.description_label.setObjectName("sectionTitle")
+        # Plain text label: no hover feedback to render
+        self.description_label.setAttribute(Qt.WA_Hover, False)
+        self.description_label.setMouseTracking(False)
+        feedback_layout.addWidget(self.description_label)
+
+        # Feedback input instructions
+        instructions_label = StaticLabel("Share your thoughts, suggestions, or feedback below:")
+        instructions_label.setObjectName("secondaryLabel")
+        feedback_layout.addWidget(instructions_label)
+
+        # Enhanced feedback text area
+        self.feedback_text = FeedbackTextEdit(submit_callback=self._submit_feedback)
+        self.feedback_text.setMinimumHeight(120)
+        self.feedback_text.setPlaceholderText("Type your feedback here...\n\nPress Ctrl+Enter to submit quickly, or use the button below.")
+        
+        # Improve font for better readability
+        feedback_font = self.feedback_text.font()
+        feedback_font.setPointSize(13)
+        feedback_font.setFamily("-apple-system, BlinkMacSystemFont, 'Segoe UI', 'SF Pro Text', system-ui, sans-serif")
+        self.feedback_text.setFont(feedback_font)
+        
+        feedback_layout.addWidget(self.feedback_text)
+
+        # Submit button with enhanced styling
+        submit_button = QPushButton("Send Feedback")
+        submit_button.setObjectName("successButton")
+        submit_button.setFixedHeight(48)
+        submit_button.clicked.connect(self._submit_feedback)
+        feedback_layout.addWidget(submit_button)
+
+        # Add the feedback section to main layout
+        layout.addWidget(self.feedback_group)
+
+        # Enhanced credits/contact label
+        contact_label = QLabel('Designed with ❤️ • Contact <a href="https://x.com/fabiomlferreira">Fábio Ferreira</a> • Visit <a href="https://dotcursorrules.com/">dotcursorrules.com</a>')
+        contact_label.setObjectName("contactLabel")
+        contact_label.setOpenExternalLinks(True)
+        contact_label.setAlignment(Qt.AlignCenter)
+        contact_label.setContentsMargins(0, 8, 0, 8)
+        layout.addWidget(contact_label)
+        
+        # Ensure proper minimum window size
+        self.setMinimumSize(500, 400)
+        
+        # Set focus to feedback text by default
+        self.feedback_text.setFocus()
+
+    def _ensure_command_section(self):
+        # Build the command section on first use; most sessions never open it
+        if self.command_group is not None:
+            return
+        self.command_group = self._build_command_section()
+        # Keep it right below the toggle button, above the feedback group
+        self.centralWidget().layout().insertWidget(1, self.command_group)
+
+    def _build_command_section(self) -> QGroupBox:
         # Command section with Apple card design
-        self.command_group = QGroupBox("Command & Console")
-        command_layout = QVBoxLayout(self.command_group)
+        command_group = QGroupBox("Command & Console")
+        command_layout = QVBoxLayout(command_group)
         command_layout.setSpacing(16)
         command_layout.setContentsMargins(20, 24, 20, 20)
 
         # Working directory label with improved styling
         formatted_path = self._format_windows_path(self.project_directory)
-        working_dir_label = QLabel(f"Working Directory")
+        working_dir_label = StaticLabel("Working Directory")
         working_dir_label.setObjectName("sectionTitle")
         command_layout.addWidget(working_dir_label)
         
@@ -622,7 +939,7 @@ class FeedbackUI(QMainWindow):
         command_layout.addSpacing(8)
 
         # Command input section
-        command_title = QLabel("Command")
+        command_title = StaticLabel("Command")
         command_title.setObjectName("sectionTitle")
         command_layout.addWidget(command_title)
         
@@ -639,6 +956,8 @@ class FeedbackUI(QMainWindow):
         self.run_button = QPushButton("Run")
         self.run_button.setFixedWidth(100)
         self.run_button.clicked.connect(self._run_command)
+        # Remember the idle style so stopping restores it without a re-polish
+        self._run_button_default_qss = self.run_button.styleSheet()
 
         command_input_layout.addWidget(self.command_entry)
         command_input_layout.addWidget(self.run_button)
@@ -666,7 +985,7 @@ class FeedbackUI(QMainWindow):
         command_layout.addSpacing(16)
 
         # Console section with enhanced styling
-        console_title = QLabel("Console Output")
+        console_title = StaticLabel("Console Output")
         console_title.setObjectName("sectionTitle")
         command_layout.addWidget(console_title)
 
@@ -675,6 +994,14 @@ class FeedbackUI(QMainWindow):
         self.log_text.setObjectName("consoleText")
         self.log_text.setReadOnly(True)
         self.log_text.setMinimumHeight(180)
+        # Cap the document so long-running commands can't grow it (and the
+        # cost of each append) without bound; old blocks are dropped in O(1)
+        self.log_text.document().setMaximumBlockCount(10_000)
+        # Read-only console has no hover styling, so skip hover/mouse-move
+        # processing entirely — it would otherwise repaint while output streams
+        self.log_text.setAttribute(Qt.WA_Hover, False)
+        self.log_text.setMouseTracking(False)
+        self.log_text.viewport().setMouseTracking(False)
         
         # Use system monospace font for better cross-platform compatibility
         font = QFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
@@ -695,65 +1022,14 @@ class FeedbackUI(QMainWindow):
         button_layout.addWidget(self.clear_button)
         command_layout.addLayout(button_layout)
 
-        # Initially hide command section
-        self.command_group.setVisible(False) 
-        layout.addWidget(self.command_group)
-
-        # Feedback section with enhanced Apple card design
-        self.feedback_group = QGroupBox("Interactive Feedback")
-        feedback_layout = QVBoxLayout(self.feedback_group)
-        feedback_layout.setSpacing(16)
-        feedback_layout.setContentsMargins(20, 24, 20, 20)
-
-        # Description label with better typography
-        self.description_label = QLabel(self.prompt)
-        self.description_label.setWordWrap(True)
-        self.description_label.setObjectName("sectionTitle")
-        feedback_layout.addWidget(self.description_label)
-
-        # Feedback input instructions
-        instructions_label = QLabel("Share your thoughts, suggestions, or feedback below:")
-        instructions_label.setObjectName("secondaryLabel")
-        feedback_layout.addWidget(instructions_label)
-
-        # Enhanced feedback text area
-        self.feedback_text = FeedbackTextEdit()
-        self.feedback_text.setMinimumHeight(120)
-        self.feedback_text.setPlaceholderText("Type your feedback here...\n\nPress Ctrl+Enter to submit quickly, or use the button below.")
-        
-        # Improve font for better readability
-        feedback_font = self.feedback_text.font()
-        feedback_font.setPointSize(13)
-        feedback_font.setFamily("-apple-system, BlinkMacSystemFont, 'Segoe UI', 'SF Pro Text', system-ui, sans-serif")
-        self.feedback_text.setFont(feedback_font)
-        
-        feedback_layout.addWidget(self.feedback_text)
-
-        # Submit button with enhanced styling
-        submit_button = QPushButton("Send Feedback")
-        submit_button.setObjectName("successButton")
-        submit_button.setFixedHeight(48)
-        submit_button.clicked.connect(self._submit_feedback)
-        feedback_layout.addWidget(submit_button)
-
-        # Add the feedback section to main layout
-        layout.addWidget(self.feedback_group)
 
-        # Enhanced credits/contact label
-        contact_label = QLabel('Designed with ❤️ • Contact <a href="https://x.com/fabiomlferreira">Fábio Ferreira</a> • Visit <a href="https://dotcursorrules.com/">dotcursorrules.com</a>')
-        contact_label.setObjectName("contactLabel")
-        contact_label.setOpenExternalLinks(True)
-        contact_label.setAlignment(Qt.AlignCenter)
-        contact_label.setContentsMargins(0, 8, 0, 8)
-        layout.addWidget(contact_label)
-        
-        # Ensure proper minimum window size
-        self.setMinimumSize(500, 400)
-        
-        # Set focus to feedback text by default
-        self.feedback_text.setFocus()
+        # Hidden until the caller decides otherwise
+        command_group.setVisible(False)
+        return command_group
 
+    @Slot()
     def _toggle_command_section(self):
+        self._ensure_command_section()
         is_visible = self.command_group.isVisible()
         self.command_group.setVisible(not is_visible)
         if not is_visible:
@@ -761,237 +1037,319 @@ class FeedbackUI(QMainWindow):
         else:
             self.toggle_command_button.setText("Show Command & Console")
         
-        # Immediately save the visibility state for this project
-        self.settings.beginGroup(self.project_group_name)
-        self.settings.setValue("commandSectionVisible", self.command_group.isVisible())
-        self.settings.endGroup()
+        # Persist the visibility state for this project (debounced)
+        self._set_setting("commandSectionVisible", self.command_group.isVisible())
 
-        # Improved window resizing logic to prevent button displacement
-        QApplication.processEvents()  # Process pending events first
-        
-        # Force layout updates before calculating sizes
-        self.centralWidget().layout().update()
-        self.centralWidget().updateGeometry()
-        
-        # Get current and preferred sizes
-        current_size = self.size()
-        preferred_size = self.centralWidget().sizeHint()
-        
-        # Calculate safe new dimensions with better logic
-        min_width = max(500, self.minimumWidth())  # Respect minimum window width
-        new_width = max(current_size.width(), preferred_size.width(), min_width)
-        
-        if self.command_group.isVisible():
-            # When showing command section, add height incrementally
-            command_section_height = self.command_group.sizeHint().height()
-            new_height = current_size.height() + command_section_height + 50  # Extra padding
-        else:
-            # When hiding command section, calculate optimal height
-            new_height = max(400, preferred_size.height() + 50)
-        
-        # Apply resize gradually to prevent layout jumps
-        self.resize(new_width, new_height)
-        
-        # Ensure layout is properly updated
-        QApplication.processEvents()
-        self.centralWidget().layout().activate()
-        
-        # Verify button is still properly positioned and sized
-        self.toggle_command_button.updateGeometry()
-        
-        # Final window position check to prevent off-screen displacement
-        screen_geometry = QApplication.primaryScreen().geometry()
+        # One relayout + one paint: invalidate the layout and let Qt compute
+        # the new window size itself instead of manual resize math with
+        # processEvents() in between.
+        self.centralWidget().layout().invalidate()
+        self.adjustSize()
+
+        # Nudge the window back if the resize pushed it past a screen edge
+        screen_geometry = QApplication.primaryScreen().availableGeometry()
         window_geometry = self.geometry()
-        
-        # Adjust position if window extends beyond screen boundaries
         new_x = window_geometry.x()
         new_y = window_geometry.y()
-        
+
         if window_geometry.bottom() > screen_geometry.bottom():
-            new_y = max(0, screen_geometry.bottom() - window_geometry.height())
-        
+            new_y = max(screen_geometry.y(), screen_geometry.bottom() - window_geometry.height())
+
         if window_geometry.right() > screen_geometry.right():
-            new_x = max(0, screen_geometry.right() - window_geometry.width())
-        
+            new_x = max(screen_geometry.x(), screen_geometry.right() - window_geometry.width())
+
         if new_x != window_geometry.x() or new_y != window_geometry.y():
             self.move(new_x, new_y)
 
+    @Slot()
     def _update_config(self):
+        # In-memory only: typing a one-off command must not overwrite the
+        # project's saved configuration. Persisting is the Save button's job.
         self.config["run_command"] = self.command_entry.text()
         self.config["execute_automatically"] = self.auto_check.isChecked()
 
+    def _set_setting(self, key: str, value) -> None:
+        # Update the in-memory snapshot; only real changes are marked dirty
+        # and make it to disk on the next flush
+        if self._project_settings.get(key) == value:
+            return
+        self._project_settings[key] = value
+        self._settings_dirty.add(key)
+        self._settings_flush_timer.start()
+
+    @Slot()
+    def _flush_settings(self):
+        # Hand just the keys that actually changed to the writer thread
+        if not self._settings_dirty:
+            return
+        for key in self._settings_dirty:
+            self._settings_writer.enqueue(
+                self.project_group_name, key, self._project_settings[key]
+            )
+        self._settings_dirty.clear()
+
+    @Slot(str)
     def _append_log(self, text: str):
-        self.log_buffer.append(text)
-        self.log_text.append(text.rstrip())
-        cursor = self.log_text.textCursor()
+        self.log_buffer.write(text)
+        if self.log_buffer.tell() > _LOG_BUFFER_LIMIT:
+            # Drop the oldest half so trimming stays amortized, keeping the
+            # newest output that feedback is most likely to reference
+            tail = self.log_buffer.getvalue()[-_LOG_BUFFER_LIMIT // 2:]
+            self.log_buffer = io.StringIO()
+            self.log_buffer.write(tail)
+        self._pending_log.append(text)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    @Slot()
+    def _flush_pending_log(self):
+        if not self._pending_log:
+            return
+        # Backpressure: if the process outran the flush timer, render only
+        # the newest chunks and summarize the rest, so per-flush layout work
+        # stays bounded no matter how fast the producer is. The full text is
+        # still in log_buffer for the returned FeedbackResult.
+        elided = len(self._pending_log) - _LOG_FLUSH_MAX_CHUNKS
+        if elided > 0:
+            del self._pending_log[:elided]
+            self._pending_log.insert(0, f"\n[... {elided} chunks elided ...]\n")
+        # One plain-text insert per flush, however many chunks arrived since
+        # the last one. Inserting through a document cursor leaves the
+        # widget's visible cursor (and its change/scroll signals) alone.
+        joined = "".join(self._pending_log)
+        self._pending_log.clear()
+        scrollbar = self.log_text.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+        cursor = QTextCursor(self.log_text.document())
         cursor.movePosition(QTextCursor.End)
-        self.log_text.setTextCursor(cursor)
+        cursor.insertText(joined)
+        # Follow the output only if the user hasn't scrolled up to read
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
 
-    def _check_process_status(self):
-        if self.process and self.process.poll() is not None:
-            # Process has terminated
-            exit_code = self.process.poll()
-            self._append_log(f"\nProcess exited with code {exit_code}\n")
-            self.run_button.setText("Run")
-            self.run_button.setObjectName("")  # Reset to default style
-            self.run_button.setStyleSheet("")  # Clear any custom styles
-            self.process = None
-            self.activateWindow()
-            self.feedback_text.setFocus()
+    @Slot()
+    def _read_process_stdout(self):
+        if self.process:
+            data = bytes(self.process.readAllStandardOutput())
+            self._append_log(self._stdout_decoder.decode(data))
 
+    @Slot()
+    def _read_process_stderr(self):
+        if self.process:
+            data = bytes(self.process.readAllStandardError())
+            self._append_log(self._stderr_decoder.decode(data))
+
+    @Slot(int, QProcess.ExitStatus)
+    def _on_process_finished(self, exit_code: int, exit_status: QProcess.ExitStatus):
+        self._append_log(f"\nProcess exited with code {exit_code}\n")
+        self.run_button.setText("Run")
+        self.run_button.setStyleSheet(self._run_button_default_qss)
+        self.process = None
+        self.activateWindow()
+        self.feedback_text.setFocus()
+
+    @Slot(QProcess.ProcessError)
+    def _on_process_error(self, error: QProcess.ProcessError):
+        # finished is never emitted when the program can't start (e.g. a
+        # typo'd command on the direct-exec path), so reset here; any other
+        # error is still followed by finished, which does the reset
+        if error != QProcess.ProcessError.FailedToStart or self.process is None:
+            return
+        self._append_log(f"Error running command: {self.process.errorString()}\n")
+        self.process = None
+        self.run_button.setText("Run")
+        self.run_button.setStyleSheet(self._run_button_default_qss)
+
+    @Slot()
     def _run_command(self):
         if self.process:
-            kill_tree(self.process)
+            # Stop requested: the button is reset here, so don't let the
+            # finished signal report the kill as a normal exit
+            self.process.finished.disconnect(self._on_process_finished)
+            kill_tree(int(self.process.processId()))
             self.process = None
             self.run_button.setText("Run")
-            self.run_button.setObjectName("")  # Reset to default style
-            self.run_button.setStyleSheet("")  # Clear any custom styles
+            self.run_button.setStyleSheet(self._run_button_default_qss)
             return
 
         # Clear the log buffer but keep UI logs visible
-        self.log_buffer = []
+        self.log_buffer = io.StringIO()
 
         command = self.command_entry.text()
         if not command:
             self._append_log("Please enter a command to run\n")
             return
 
+        self._stdout_decoder.reset()
+        self._stderr_decoder.reset()
+
         self._append_log(f"$ {command}\n")
         self.run_button.setText("Stop")
-        # Apply a warning style to the stop button
-        self.run_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                           stop:0 #FF3B30, stop:1 #D70015);
-                border: none;
-                border-radius: 12px;
-                color: #FFFFFF;
-                font-weight: 600;
-                font-size: 14px;
-                padding: 12px 24px;
-                min-height: 20px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                           stop:0 #FF453A, stop:1 #DC1E1E);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                           stop:0 #D70015, stop:1 #B20000);
-            }
-        """)
+        # Apply the pre-built warning style to the stop button
+        self.run_button.setStyleSheet(_STOP_BUTTON_QSS)
 
         try:
-            self.process = subprocess.Popen(
-                command,
-                shell=True,
-                cwd=self.project_directory,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=get_user_environment(),
-                text=True,
-                bufsize=1,
-                encoding="utf-8",
-                errors="ignore",
-                close_fds=True,
-            )
-
-            def read_output(pipe):
-                for line in iter(pipe.readline, ""):
-                    self.log_signals.append_log.emit(line)
-
-            threading.Thread(
-                target=read_output,
-                args=(self.process.stdout,),
-                daemon=True
-            ).start()
-
-            threading.Thread(
-                target=read_output,
-                args=(self.process.stderr,),
-                daemon=True
-            ).start()
-
-            # Start process status checking
-            self.status_timer = QTimer()
-            self.status_timer.timeout.connect(self._check_process_status)
-            self.status_timer.start(100)  # Check every 100ms
+            # QProcess reads the pipes asynchronously on the Qt event loop, so
+            # no Python reader threads (and no cross-thread signal hops) are
+            # needed to get output into the console.
+            self.process = QProcess(self)
+            self.process.setWorkingDirectory(self.project_directory)
+
+            if self._user_env is None:
+                # On Windows get_user_environment rebuilds the user profile
+                # block through Win32 APIs; do that once per window, not per
+                # Run click
+                env = QProcessEnvironment()
+                for key, value in get_user_environment().items():
+                    env.insert(key, value)
+                self._user_env = env
+            self.process.setProcessEnvironment(self._user_env)
+
+            self.process.readyReadStandardOutput.connect(self._read_process_stdout)
+            self.process.readyReadStandardError.connect(self._read_process_stderr)
+            # Event-driven exit notification — no polling timer needed
+            self.process.finished.connect(self._on_process_finished)
+            self.process.errorOccurred.connect(self._on_process_error)
+
+            argv = _split_direct_command(command)
+            if argv:
+                # Plain command: exec it directly and skip the intermediate
+                # shell fork+exec and parse
+                self.process.start(argv[0], argv[1:])
+            elif sys.platform == "win32":
+                self.process.start("cmd", ["/c", command])
+            else:
+                self.process.start("/bin/sh", ["-c", command])
 
         except Exception as e:
             self._append_log(f"Error running command: {str(e)}\n")
             self.run_button.setText("Run")
 
+    @Slot()
     def _submit_feedback(self):
         self.feedback_result = FeedbackResult(
-            logs="".join(self.log_buffer),
+            logs=self.log_buffer.getvalue(),
             interactive_feedback=self.feedback_text.toPlainText().strip(),
         )
         self.close()
 
+    @Slot()
     def clear_logs(self):
-        self.log_buffer = []
+        self.log_buffer = io.StringIO()
+        self._pending_log.clear()
         self.log_text.clear()
 
+    @Slot()
     def _save_config(self):
-        # Save run_command and execute_automatically to QSettings under project group
-        self.settings.beginGroup(self.project_group_name)
-        self.settings.setValue("run_command", self.config["run_command"])
-        self.settings.setValue("execute_automatically", self.config["execute_automatically"])
-        self.settings.endGroup()
+        # Explicit save: mark the run configuration dirty and flush
+        # immediately instead of waiting for the debounce
+        self._set_setting("run_command", self.config["run_command"])
+        self._set_setting("execute_automatically", self.config["execute_automatically"])
+        self._settings_flush_timer.stop()
+        self._flush_settings()
         self._append_log("Configuration saved for this project.\n")
 
-    def closeEvent(self, event):
-        # Save general UI settings for the main window (geometry, state)
-        self.settings.beginGroup("MainWindow_General")
-        self.settings.setValue("geometry", self.saveGeometry())
-        self.settings.setValue("windowState", self.saveState())
-        self.settings.endGroup()
+    def moveEvent(self, event):
+        # Qt replays the pending move/resize from __init__'s restoreGeometry
+        # during show(), before WA_WState_Visible is set; only events after
+        # that reflect actual window activity
+        if self.isVisible():
+            self._geometry_dirty = True
+        super().moveEvent(event)
 
-        # Save project-specific command section visibility (this is now slightly redundant due to immediate save in toggle, but harmless)
-        self.settings.beginGroup(self.project_group_name)
-        self.settings.setValue("commandSectionVisible", self.command_group.isVisible())
-        self.settings.endGroup()
+    def resizeEvent(self, event):
+        if self.isVisible():
+            self._geometry_dirty = True
+        super().resizeEvent(event)
+
+    def closeEvent(self, event):
+        # Save general UI settings for the main window (geometry, state),
+        # skipping the saveGeometry/saveState serialization entirely when the
+        # window was never moved or resized
+        if self._geometry_dirty:
+            geometry = self.saveGeometry()
+            if geometry != self._loaded_geometry:
+                self._settings_writer.enqueue("MainWindow_General", "geometry", geometry)
+            state = self.saveState()
+            if state != self._loaded_window_state:
+                self._settings_writer.enqueue("MainWindow_General", "windowState", state)
+
+        # Flush any debounced project-specific writes before the window goes
+        # away. The shared writer thread stays up — another window opened in
+        # this process must not inherit a dying thread that drops its writes —
+        # and is stopped once, at interpreter exit
+        self._settings_flush_timer.stop()
+        self._flush_settings()
 
         if self.process:
-            kill_tree(self.process)
+            kill_tree(int(self.process.processId()))
         super().closeEvent(event)
 
+        if self._event_loop is not None:
+            self._event_loop.quit()
+
     def run(self) -> FeedbackResult:
+        # A local event loop, quit from closeEvent, doesn't depend on the
+        # application's quitOnLastWindowClosed policy and stays re-entrant
+        # when the host process is already inside its own exec()
+        self._event_loop = QEventLoop(self)
         self.show()
-        QApplication.instance().exec()
+        self._event_loop.exec()
+        self._event_loop = None
 
         if self.process:
-            kill_tree(self.process)
+            kill_tree(int(self.process.processId()))
 
         if not self.feedback_result:
-            return FeedbackResult(logs="".join(self.log_buffer), interactive_feedback="")
+            return FeedbackResult(logs=self.log_buffer.getvalue(), interactive_feedback="")
 
         return self.feedback_result
 
+@functools.lru_cache(maxsize=64)
 def get_project_settings_group(project_dir: str) -> str:
     # Create a safe, unique group name from the project directory path
     # Using only the last component + hash of full path to keep it somewhat readable but unique
+    # Memoized: long-lived MCP hosts relaunch the UI for the same few projects
     basename = os.path.basename(os.path.normpath(project_dir))
-    full_hash = hashlib.md5(project_dir.encode('utf-8')).hexdigest()[:8]
+    # blake2b with a 4-byte digest yields exactly 8 hex chars and is faster
+    # than hashing with MD5 and slicing its 32-char hexdigest
+    full_hash = hashlib.blake2b(project_dir.encode('utf-8'), digest_size=4).hexdigest()
     return f"{basename}_{full_hash}"
 
 def feedback_ui(project_directory: str, prompt: str, output_file: Optional[str] = None) -> Optional[FeedbackResult]:
     app = QApplication.instance() or QApplication()
-    app.setPalette(get_apple_design_palette(app))
-    app.setStyle("Fusion")
-    
-    # Apply the Apple stylesheet globally
-    app.setStyleSheet(get_apple_styles())
-    
+
+    # Style the application once per process: re-invocations inside a
+    # long-lived MCP host reuse the already-applied stylesheet instead of
+    # forcing Qt to re-parse and re-polish everything. The rendered sheet
+    # itself is memoized by styles_for().
+    if not app.property("_apple_styles_applied"):
+        app.setStyle("Fusion")
+        app.setStyleSheet(get_apple_styles())
+        app.setProperty("_apple_styles_applied", True)
+
     ui = FeedbackUI(project_directory, prompt)
     result = ui.run()
 
     if output_file and result:
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else ".", exist_ok=True)
-        # Save the result to the output file
-        with open(output_file, "w") as f:
-            json.dump(result, f)
+        # Ensure the directory exists; in the common case it already does and
+        # a single isdir check is cheaper than entering makedirs
+        output_dir = os.path.dirname(output_file) or "."
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+        # Serialize with orjson when available (bytes out, no escaping pass)
+        # and write through a temp file + os.replace so a crash mid-write
+        # can't leave the server reading a truncated result
+        if orjson is not None:
+            payload = orjson.dumps(result)
+        else:
+            payload = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        tmp_file = output_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, output_file)
         return None
 
     return result
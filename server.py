@@ -36,6 +36,9 @@ def launch_feedback_ui(project_directory: str, summary: str) -> dict[str, str]:
             "--prompt", summary,
             "--output-file", output_file
         ]
+        # close_fds is already the default and passing it explicitly can keep
+        # CPython off the posix_spawn fast path, which matters because this
+        # spawns a fresh interpreter per feedback round-trip
         result = subprocess.run(
             args,
             check=False,
@@ -43,13 +46,13 @@ def launch_feedback_ui(project_directory: str, summary: str) -> dict[str, str]:
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
             stdin=subprocess.DEVNULL,
-            close_fds=True
         )
         if result.returncode != 0:
             raise Exception(f"Failed to launch feedback UI: {result.returncode}")
 
-        # Read the result from the temporary file
-        with open(output_file, 'r') as f:
+        # Read the result from the temporary file. The UI writes raw UTF-8
+        # (ensure_ascii is off), so don't rely on the locale codepage here
+        with open(output_file, 'r', encoding='utf-8') as f:
             result = json.load(f)
         os.unlink(output_file)
         return result